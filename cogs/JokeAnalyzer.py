@@ -3,20 +3,45 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ext.commands import Context
-import aiohttp
-import json
+import httpx
+import orjson
 import base64
 import asyncio
-from openai import OpenAI
+import hashlib
+import re
+import sys
+import time
+from collections import OrderedDict
+from aiolimiter import AsyncLimiter
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 import logging
 
 # 设置日志记录
 logger = logging.getLogger(__name__)
 
+
+def _is_retryable(exc: BaseException) -> bool:
+    """判斷異常是否值得重試（網絡錯誤、超時、429/5xx）"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    if isinstance(exc, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    # openai僅在配置了MiniMax金鑰時才會被導入，未導入時自然沒有它的異常
+    openai = sys.modules.get("openai")
+    return openai is not None and isinstance(exc, openai.APIError)
+
 class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
     def __init__(self, bot) -> None:
         self.bot = bot
-        
+
+        # 共用的httpx客戶端（在setup中創建，HTTP/2多路復用 + 持久連接池）
+        self.http_client: httpx.AsyncClient = bot.http_client
+
         # DeepSeek配置
         self.DEEPSEEK_API_URL = "https://api.deepseek.com/chat/completions"
         self.DEEPSEEK_MODEL = "deepseek-chat"
@@ -26,12 +51,51 @@ class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
         self.MINIMAX_API_KEY = os.getenv("MINIMAX_API_KEY")
         self.minimax_client = None
         if self.MINIMAX_API_KEY:
-            self.minimax_client = OpenAI(
+            # 延遲導入：openai會拉起pydantic等重依賴，未配置金鑰時不付這筆啟動成本
+            from openai import AsyncOpenAI
+
+            self.minimax_client = AsyncOpenAI(
                 api_key=self.MINIMAX_API_KEY,
                 base_url="https://api.minimaxi.com/v1",
                 timeout=30.0  # 增加超时时间
             )
         
+        # 分析結果緩存（精確匹配 + TTL + LRU淘汰，避免重複付費調用API）
+        self.CACHE_TTL_SECONDS = 24 * 3600
+        self.MAX_CACHE_SIZE = 1000
+        self._cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+        # 請求批處理（短窗口內到達的文字分析合併為一次API調用）
+        self.BATCH_MAX_SIZE = 8
+        self.BATCH_MAX_WAIT = 0.05  # 秒
+        self._batch_queue: asyncio.Queue[tuple[str, asyncio.Future]] = asyncio.Queue()
+        self._batch_task: asyncio.Task | None = None
+
+        # 進行中請求去重：相同鍵的後續調用直接等待已在途的future
+        self._inflight: dict[str, asyncio.Future] = {}
+
+        # 流式輸出時編輯Discord消息的最小間隔（秒），避免觸發編輯速率限制
+        self.STREAM_EDIT_INTERVAL = 0.5
+
+        # 反應處理工作池：有界隊列 + 固定數量worker，反應風暴時優雅降級
+        self.REACTION_WORKERS = 8
+        self.REACTION_QUEUE_SIZE = 256
+        self._reaction_queue: asyncio.Queue[tuple[discord.Reaction, discord.User]] = (
+            asyncio.Queue(maxsize=self.REACTION_QUEUE_SIZE)
+        )
+        self._reaction_worker_tasks: list[asyncio.Task] = []
+
+        # 出站限流：並發上限 + 每分鐘令牌桶，主動整形流量避免撞上供應商的429
+        self.MAX_CONCURRENT_REQUESTS = 8
+        self.REQUESTS_PER_MINUTE = 60
+        self._rate_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._rate_bucket = AsyncLimiter(self.REQUESTS_PER_MINUTE, 60)
+
+        # 圖片URL檢測（預編譯，支持帶查詢串的CDN鏈接）
+        self.IMAGE_URL_RE = re.compile(
+            r"^https?://\S+\.(?:jpe?g|png|gif|webp)(?:\?\S*)?$", re.IGNORECASE
+        )
+
         # 表情触发设置
         self.EMOJI_TRIGGER = "🤡"
         self.MAX_TOKENS = 150
@@ -41,45 +105,287 @@ class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
             "保持回應在100字以內，最後輸出'令人忍俊不禁。'。"
         )
 
+        # 預構建每次請求都相同的headers和system消息，避免熱路徑上重複分配；
+        # 金鑰是否配置只在這裡判斷一次，熱路徑僅檢查布爾值
+        self._deepseek_ready = bool(self.deepseek_api_key)
+        self._deepseek_headers = {
+            "Authorization": f"Bearer {self.deepseek_api_key}",
+            "Content-Type": "application/json",
+        } if self._deepseek_ready else None
+        self._system_msg = {"role": "system", "content": self.ANALYSIS_PROMPT}
+
+    async def cog_load(self) -> None:
+        """啟動長駐的批處理任務和反應處理工作池"""
+        self._batch_task = self.bot.loop.create_task(self._batch_worker())
+        self._reaction_worker_tasks = [
+            self.bot.loop.create_task(self._reaction_worker())
+            for _ in range(self.REACTION_WORKERS)
+        ]
+
+    async def cog_unload(self) -> None:
+        """卸載時停止後台任務並關閉共用的httpx客戶端"""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+        for task in self._reaction_worker_tasks:
+            task.cancel()
+        if not self.http_client.is_closed:
+            await self.http_client.aclose()
+
+    def _cache_key(self, model: str, prompt: str) -> str:
+        """標準化內容後生成緩存鍵（空白折疊 + 小寫，讓輕微差異也能命中）"""
+        normalized = re.sub(r"\s+", " ", prompt.lower()).strip()
+        return hashlib.sha256(f"{model}:{normalized}".encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> str | None:
+        """查詢緩存，過期條目直接丟棄"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        timestamp, result = entry
+        if time.time() - timestamp > self.CACHE_TTL_SECONDS:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: str, result: str) -> None:
+        """寫入緩存，超過容量時按LRU淘汰最舊條目"""
+        self._cache[key] = (time.time(), result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.MAX_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
     async def analyze_text_joke(self, content: str) -> str:
-        """使用DeepSeek分析文字笑話"""
-        if not self.deepseek_api_key:
+        """使用DeepSeek分析文字笑話（經由批處理隊列合併併發請求）"""
+        if not self._deepseek_ready:
             return "❌ DeepSeek API金鑰未配置，無法分析笑話"
-        
-        headers = {"Authorization": f"Bearer {self.deepseek_api_key}", "Content-Type": "application/json"}
+
+        cache_key = self._cache_key(self.DEEPSEEK_MODEL, content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # 相同內容已在分析中時，直接搭已在途請求的順風車
+        existing = self._inflight.get(cache_key)
+        if existing is not None:
+            return await existing
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            await self._batch_queue.put((content, future))
+            result = await future
+        finally:
+            self._inflight.pop(cache_key, None)
+        if not result.startswith("❌"):
+            self._cache_put(cache_key, result)
+        return result
+
+    async def analyze_text_joke_stream(self, content: str, bot_msg: discord.Message, title: str) -> str:
+        """流式分析文字笑話，邊生成邊編輯bot_msg以降低可感延遲
+
+        命令路徑專用；緩存命中時直接返回完整結果，不走流式請求。
+        """
+        if not self._deepseek_ready:
+            return "❌ DeepSeek API金鑰未配置，無法分析笑話"
+
+        cache_key = self._cache_key(self.DEEPSEEK_MODEL, content)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            result = await self._stream_text_analysis(content, bot_msg, title)
+        except httpx.HTTPStatusError as e:
+            logger.error(f"DeepSeek API錯誤 (狀態碼: {e.response.status_code})")
+            return f"❌ API錯誤 (狀態碼: {e.response.status_code})"
+        except Exception as e:
+            logger.exception("文字分析失敗")
+            return f"❌ 分析失敗: {str(e)}"
+
+        if result:
+            self._cache_put(cache_key, result)
+        return result
+
+    async def _stream_text_analysis(self, content: str, bot_msg: discord.Message, title: str) -> str:
+        """發送stream=true的DeepSeek請求，按間隔把累積的token編輯進消息"""
+        payload = {
+            "model": self.DEEPSEEK_MODEL,
+            "messages": [
+                self._system_msg,
+                {"role": "user", "content": content}
+            ],
+            "max_tokens": self.MAX_TOKENS,
+            "temperature": 0.7,
+            "stream": True
+        }
+
+        buf = ""
+        last_edit = 0.0
+        async with self._rate_semaphore, self._rate_bucket, self.http_client.stream(
+            "POST",
+            self.DEEPSEEK_API_URL,
+            headers=self._deepseek_headers,
+            content=orjson.dumps(payload)
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                chunk = line[5:].strip()
+                if chunk == "[DONE]":
+                    break
+                try:
+                    delta = orjson.loads(chunk)["choices"][0]["delta"].get("content", "")
+                except (orjson.JSONDecodeError, KeyError, IndexError):
+                    continue
+                if not delta:
+                    continue
+                buf += delta
+                now = self.bot.loop.time()
+                if now - last_edit >= self.STREAM_EDIT_INTERVAL:
+                    last_edit = now
+                    partial = discord.Embed(
+                        title=title,
+                        description=f"{buf[:2000]} ▌",
+                        color=0x097969
+                    )
+                    await bot_msg.edit(content=None, embed=partial)
+        return buf.strip()
+
+    async def _batch_worker(self) -> None:
+        """長駐任務：收集短窗口內到達的文字分析請求並合併發送"""
+        while True:
+            batch = [await self._batch_queue.get()]
+            deadline = self.bot.loop.time() + self.BATCH_MAX_WAIT
+            while len(batch) < self.BATCH_MAX_SIZE:
+                remaining = deadline - self.bot.loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._batch_queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            await self._process_batch(batch)
+
+    async def _process_batch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """處理一批請求：多條時嘗試合併調用，失敗則逐條回退"""
+        results = None
+        if len(batch) > 1:
+            results = await self._request_text_batch([content for content, _ in batch])
+        if results is not None:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            return
+        for content, future in batch:
+            result = await self._request_text_analysis(content)
+            if not future.done():
+                future.set_result(result)
+
+    @retry(
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        stop=stop_after_attempt(4),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
+    )
+    async def _post_deepseek(self, payload: dict) -> dict:
+        """發送DeepSeek請求並返回解析後的JSON，429/5xx時按指數退避重試"""
+        async with self._rate_semaphore, self._rate_bucket:
+            response = await self.http_client.post(
+                self.DEEPSEEK_API_URL,
+                headers=self._deepseek_headers,
+                content=orjson.dumps(payload)
+            )
+        if response.status_code == 429 or response.status_code >= 500:
+            # 尊重服務端的Retry-After，再拋出讓tenacity重試
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    await asyncio.sleep(min(float(retry_after), 8))
+                except ValueError:
+                    pass
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def _request_text_analysis(self, content: str) -> str:
+        """發送單條DeepSeek請求"""
         payload = {
             "model": self.DEEPSEEK_MODEL,
             "messages": [
-                {"role": "system", "content": self.ANALYSIS_PROMPT},
+                self._system_msg,
                 {"role": "user", "content": content}
             ],
             "max_tokens": self.MAX_TOKENS,
             "temperature": 0.7
         }
-        
+
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-                async with session.post(
-                    self.DEEPSEEK_API_URL, 
-                    headers=headers, 
-                    json=payload
-                ) as response:
-                    
-                    if response.status != 200:
-                        logger.error(f"DeepSeek API錯誤 (狀態碼: {response.status})")
-                        return f"❌ API錯誤 (狀態碼: {response.status})"
-                    
-                    data = await response.json()
-                    return data['choices'][0]['message']['content'].strip()
+            data = await self._post_deepseek(payload)
+            return data['choices'][0]['message']['content'].strip()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"DeepSeek API錯誤 (狀態碼: {e.response.status_code})")
+            return f"❌ API錯誤 (狀態碼: {e.response.status_code})"
         except Exception as e:
             logger.exception("文字分析失敗")
             return f"❌ 分析失敗: {str(e)}"
+
+    async def _request_text_batch(self, contents: list[str]) -> list[str] | None:
+        """把多條內容合併為一次DeepSeek調用，要求模型按編號返回JSON數組
+
+        解析失敗時返回None，由調用方逐條回退。
+        """
+        batch_prompt = (
+            self.ANALYSIS_PROMPT
+            + "你會收到多個編號的內容，請對每個內容分別分析，"
+            "並以JSON字符串數組形式返回，數組第i項對應第i個內容，不要輸出其他文字。"
+        )
+        numbered = "\n\n".join(f"{i + 1}. {content}" for i, content in enumerate(contents))
+        payload = {
+            "model": self.DEEPSEEK_MODEL,
+            "messages": [
+                {"role": "system", "content": batch_prompt},
+                {"role": "user", "content": numbered}
+            ],
+            "max_tokens": self.MAX_TOKENS * len(contents),
+            "temperature": 0.7
+        }
+
+        try:
+            data = await self._post_deepseek(payload)
+            text = data['choices'][0]['message']['content'].strip()
+            # 模型有時會包一層markdown代碼塊
+            if text.startswith("```"):
+                text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text).strip()
+            parsed = orjson.loads(text)
+            if isinstance(parsed, list) and len(parsed) == len(contents):
+                return [str(item).strip() for item in parsed]
+            logger.warning("批量分析返回格式不符，回退為逐條請求")
+            return None
+        except Exception:
+            logger.exception("批量文字分析失敗，回退為逐條請求")
+            return None
     
     async def analyze_image_joke(self, image_url: str) -> str:
         """使用MiniMax多模態API分析圖片笑點"""
         if not self.minimax_client:
             return "❌ MiniMax API金鑰未配置，無法分析圖片"
-        
+
+        cache_key = self._cache_key("MiniMax-Text-01", image_url)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # 相同圖片已在分析中時，直接搭已在途請求的順風車
+        existing = self._inflight.get(cache_key)
+        if existing is not None:
+            return await existing
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+
         messages = [
             {
                 "role": "system",
@@ -95,25 +401,32 @@ class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
         ]
         
         try:
-            # 添加重试机制
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    completion = self.minimax_client.chat.completions.create(
-                        model="MiniMax-Text-01",
-                        messages=messages,
-                        max_tokens=4096
-                    )
-                    return completion.choices[0].message.content
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"MiniMax API重試中 ({attempt+1}/{max_retries})")
-                        await asyncio.sleep(2)  # 等待2秒后重试
-                    else:
-                        raise
+            result = await self._request_image_analysis(messages)
+            self._cache_put(cache_key, result)
         except Exception as e:
             logger.exception("圖片分析失敗")
-            return f"❌ 圖片分析失敗: {str(e)}"
+            result = f"❌ 圖片分析失敗: {str(e)}"
+        finally:
+            self._inflight.pop(cache_key, None)
+        if not future.done():
+            future.set_result(result)
+        return result
+
+    @retry(
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        stop=stop_after_attempt(4),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
+    )
+    async def _request_image_analysis(self, messages: list) -> str:
+        """發送MiniMax多模態請求，瞬態錯誤時按指數退避重試"""
+        async with self._rate_semaphore, self._rate_bucket:
+            completion = await self.minimax_client.chat.completions.create(
+                model="MiniMax-Text-01",
+                messages=messages,
+                max_tokens=4096
+            )
+        return completion.choices[0].message.content
     
     @commands.hybrid_command(
         name="analyzejoke",
@@ -123,18 +436,20 @@ class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
     async def analyze_joke_command(self, context: Context, *, content: str) -> None:
         """命令觸發笑話分析（支持文字和圖片URL）"""
         # 檢查是否為圖片URL
-        if content.startswith("http") and any(content.lower().endswith(ext) for ext in [".jpg", ".jpeg", ".png", ".gif"]):
+        if self.IMAGE_URL_RE.match(content):
             await context.send(f"🔍 正在分析圖片笑點...")
             analysis = await self.analyze_image_joke(content)
             title = "🤖 圖片笑話分析報告"
+            bot_msg = None
         else:
             if len(content) > 500:
                 await context.send("❌ 內容太長了！請限制在500字以內")
                 return
-            await context.send(f"🔍 正在分析笑話...")
-            analysis = await self.analyze_text_joke(content)
+            # 流式輸出：首批token到達後立即開始更新這條消息
+            bot_msg = await context.send(f"🔍 正在分析笑話...")
             title = "🤖 笑話分析報告"
-        
+            analysis = await self.analyze_text_joke_stream(content, bot_msg, title)
+
         # 創建回應
         embed = discord.Embed(
             title=title,
@@ -143,36 +458,67 @@ class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
         )
         embed.add_field(name="原始內容", value=f"```{content[:200]}...```", inline=False)
         embed.set_footer(text="由 Mortis AI 提供分析")
-        await context.send(embed=embed)
+        if bot_msg is not None:
+            await bot_msg.edit(content=None, embed=embed)
+        else:
+            await context.send(embed=embed)
 
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
         """當用戶添加🤡表情時觸發分析（支持文字和圖片）"""
+        # 先檢查目標emoji：這能擋掉絕大多數事件，放在最前面最省
+        if str(reaction.emoji) != self.EMOJI_TRIGGER:
+            return
+
         # 忽略機器人自己的反應
         if user.bot:
             return
-        
-        # 檢查是否是目標emoji
-        if str(reaction.emoji) != self.EMOJI_TRIGGER:
-            return
-        
+
         message = reaction.message
-        
+
+        # 熱路徑上把discord.py屬性一次取進局部變量，後面全部復用
+        content = message.content
+        attachments = message.attachments
+
         # 忽略空消息或機器人消息
-        if not message.content and not message.attachments:
+        if not content and not attachments:
             return
-        
-        # 顯示處理中反應
-        await message.add_reaction("🔍")
-        
+
+        # 交給有界工作池處理：隊列滿時直接回覆繁忙，而不是無上限地堆任務
+        try:
+            self._reaction_queue.put_nowait((reaction, user))
+        except asyncio.QueueFull:
+            logger.warning("反應處理隊列已滿，拒絕新請求")
+            await message.reply("⏳ 分析請求過多，請稍後再試")
+
+    async def _reaction_worker(self) -> None:
+        """工作池成員：逐個消費隊列中的反應並處理"""
+        while True:
+            reaction, user = await self._reaction_queue.get()
+            try:
+                await self._process_reaction(reaction, user)
+            except Exception:
+                logger.exception("處理反應失敗")
+            finally:
+                self._reaction_queue.task_done()
+
+    async def _process_reaction(self, reaction: discord.Reaction, user: discord.User) -> None:
+        """實際執行一次反應觸發的分析（在工作池中運行）"""
+        message = reaction.message
+        content = message.content
+        attachments = message.attachments
+
+        # 並行發起處理中反應，讓LLM調用立即開始而不等Discord REST往返
+        add_task = asyncio.create_task(message.add_reaction("🔍"))
+
         analysis = ""
         title = ""
         content_source = ""
         is_image = False
         
         # 優先處理圖片附件
-        if message.attachments:
-            attachment = message.attachments[0]
+        if attachments:
+            attachment = attachments[0]
             if attachment.content_type and attachment.content_type.startswith('image'):
                 content_source = attachment.url
                 analysis = await self.analyze_image_joke(attachment.url)
@@ -180,17 +526,17 @@ class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
                 is_image = True
         
         # 如果沒有圖片附件，處理文字內容
-        elif message.content:
-            if len(message.content) > 500:
+        elif content:
+            if len(content) > 500:
                 await message.reply("❌ 消息太長無法分析！請限制在500字以內")
-                await message.remove_reaction("🔍", self.bot.user)
+                await self._clear_processing(message, add_task)
                 return
             
-            content_source = message.content
-            analysis = await self.analyze_text_joke(message.content)
+            content_source = content
+            analysis = await self.analyze_text_joke(content)
             title = "🤖 自動笑點分析"
         else:
-            await message.remove_reaction("🔍", self.bot.user)
+            await self._clear_processing(message, add_task)
             return
         
         # 創建分析報告
@@ -200,18 +546,19 @@ class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
             color=0x097969  # 綠色
         )
         
-        # 根據內容類型添加不同字段
+        # 根據內容類型添加不同字段（jump_url每次訪問都重新拼URL，只算一次）
+        jump_url = message.jump_url
         if is_image:
             embed.set_image(url=content_source)
             embed.add_field(
                 name="原始圖片", 
-                value=f"[跳轉到消息]({message.jump_url})",
+                value=f"[跳轉到消息]({jump_url})",
                 inline=False
             )
         else:
             embed.add_field(
                 name="原始消息", 
-                value=f"{content_source[:150]}...\n[跳轉到消息]({message.jump_url})",
+                value=f"{content_source[:150]}...\n[跳轉到消息]({jump_url})",
                 inline=False
             )
         
@@ -221,15 +568,33 @@ class JokeAnalyzer(commands.Cog, name="joke_analyzer"):
         )
         
         try:
-            # 發送分析結果
-            await message.reply(embed=embed)
-        except Exception as e:
-            logger.error(f"發送分析結果失敗: {str(e)}")
-            await message.reply(f"❌ 發送分析結果失敗: {str(e)}")
+            # 發送分析結果（與等待🔍反應完成並行）
+            reply_result, _ = await asyncio.gather(
+                message.reply(embed=embed), add_task, return_exceptions=True
+            )
+            if isinstance(reply_result, Exception):
+                logger.error(f"發送分析結果失敗: {str(reply_result)}")
+                await message.reply(f"❌ 發送分析結果失敗: {str(reply_result)}")
         finally:
+            await self._clear_processing(message, add_task)
+
+    async def _clear_processing(self, message: discord.Message, add_task: asyncio.Task) -> None:
+        """等🔍反應確實添加完成後再移除它，兩步都容忍失敗"""
+        try:
+            await add_task
             await message.remove_reaction("🔍", self.bot.user)
+        except Exception:
+            logger.debug("清理🔍反應失敗", exc_info=True)
 
 async def setup(bot) -> None:
+    # 創建全局共用的httpx客戶端（HTTP/2多路復用，突發請求共享一條連接）
+    if getattr(bot, "http_client", None) is None or bot.http_client.is_closed:
+        bot.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0,
+        )
+
     # 檢查API金鑰配置
     bot.deepseek_api_key = os.getenv("DSAPI")
     bot.minimax_api_key = os.getenv("MINIMAX_API_KEY")